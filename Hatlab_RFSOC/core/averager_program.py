@@ -1,7 +1,6 @@
 from typing import Dict, List, Union, Callable, Literal, Tuple
 import warnings
 from copy import deepcopy
-from tqdm import tqdm
 import numpy as np
 
 from qick.qick_asm import AcquireMixin
@@ -17,6 +16,72 @@ from Hatlab_RFSOC.waveform.waveform import add_waveform, add_waveform_concatenat
 RegisterTypes = Literal["freq", "time", "phase", "adc_freq"]
 
 
+def _fill_iq_buf(raw: List[np.ndarray], iq_offsets: List[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Copy the raw (n_pts, 2) accumulated buffers of each readout channel into separate, C-contiguous (n_ro, n_pts) I and
+    Q arrays, subtracting the accumulated IQ offset of each channel when provided. Each channel is filled with a single
+    ufunc call per quadrature.
+
+    :param raw: list of raw accumulated IQ data of each readout channel, in shape (n_pts, 2)
+    :param iq_offsets: IQ offset (already multiplied by the readout length) of each channel. Optional.
+    :return: the filled I and Q buffers
+    """
+    dtype = raw[0].dtype if iq_offsets is None else np.result_type(raw[0], *iq_offsets)
+    di_buf = np.empty((len(raw), len(raw[0])), dtype=dtype)
+    dq_buf = np.empty((len(raw), len(raw[0])), dtype=dtype)
+    for i, d in enumerate(raw):
+        if iq_offsets is None:
+            np.copyto(di_buf[i], d[:, 0])
+            np.copyto(dq_buf[i], d[:, 1])
+        else:
+            np.subtract(d[:, 0], iq_offsets[i], out=di_buf[i])
+            np.subtract(d[:, 1], iq_offsets[i], out=dq_buf[i])
+    return di_buf, dq_buf
+
+
+class _UserRegSet(set):
+    """
+    Set of the (page, addr) of all user defined registers. QickRegisterManagerMixin keeps them in a list and only uses
+    "in" and "append" on it, so a set with an "append" alias gives constant time lookup when allocating new registers.
+    """
+    append = set.add
+
+
+def _bind_reg_converters(reg: QickRegister) -> QickRegister:
+    """
+    Bind the val2reg/reg2val unit converters of a QickRegister once based on its register type, so that the type
+    dispatch in QickRegister.val2reg/reg2val is not repeated each time a register value is set during program
+    generation.
+
+    :param reg: QickRegister object
+    :return: the same register, with the converters bound on the instance
+    """
+    prog, gen_ch, ro_ch = reg.prog, reg.gen_ch, reg.ro_ch
+    if reg.reg_type == "freq":
+        val2reg = lambda val: prog.freq2reg(val, gen_ch, ro_ch)
+        reg2val = lambda r: prog.reg2freq(r, gen_ch)
+    elif reg.reg_type == "time":
+        if gen_ch is not None:
+            val2reg = lambda val: prog.us2cycles(val, gen_ch)
+            reg2val = lambda r: prog.cycles2us(r, gen_ch)
+        else:
+            val2reg = lambda val: prog.us2cycles(val, gen_ch, ro_ch)
+            reg2val = lambda r: prog.cycles2us(r, gen_ch, ro_ch)
+    elif reg.reg_type == "phase":
+        val2reg = lambda val: prog.deg2reg(val, gen_ch)
+        reg2val = lambda r: prog.reg2deg(r, gen_ch)
+    elif reg.reg_type == "adc_freq":
+        val2reg = lambda val: prog.freq2reg_adc(val, ro_ch, gen_ch)
+        reg2val = lambda r: prog.reg2freq_adc(r, ro_ch)
+    else:
+        # same as QickRegister, cast to int32 and back to python int
+        val2reg = lambda val: int(np.int32(val))
+        reg2val = lambda r: r
+    reg.val2reg = val2reg
+    reg.reg2val = reg2val
+    return reg
+
+
 class FlatTopLengthSweep(QickSweep):
     """
     Currently, the register that controls the flat part length of a flat_top pulse is packed in the last 16 bit of
@@ -57,8 +122,12 @@ class FlatTopLengthSweep(QickSweep):
         gen_mgr = prog._gen_mgrs[self.reg.gen_ch]
         self.reg.init_val = gen_mgr.get_mode_code(length=reg_start, mode="oneshot", outsel="dds")
 
+        # bind the asm emitter and its arguments once, "mathi" is generated by QickProgram.__getattr__ on each lookup
+        self._mathi = prog.mathi
+        self._update_args = (self.reg.page, self.reg.addr, self.reg.addr, '+', self.reg_step)
+
     def update(self):
-        self.prog.mathi(self.reg.page, self.reg.addr, self.reg.addr, '+', self.reg_step)
+        self._mathi(*self._update_args)
         # also sweep the wait time register in t_proc if provided
         if self.t_wait_reg is not None:
             self.t_wait_reg.set_to(self.t_wait_reg, '+', self.step_val)
@@ -128,6 +197,9 @@ class APAveragerProgram(QickRegisterManagerMixin, AcquireMixin, QickProgram):
     """
 
     COUNTER_ADDR = 1
+    # gen_chs config entries that are not passed to declare_gen, for cases when two DACs are used as IQ channels on a
+    # mixer
+    _GEN_EXCLUDE_ARGS = frozenset(("ch", "skew_phase", "IQ_scale"))
 
     def __init__(self, soccfg, cfg):
         """
@@ -135,6 +207,7 @@ class APAveragerProgram(QickRegisterManagerMixin, AcquireMixin, QickProgram):
         cfg["ro_chs"]
         """
         super().__init__(soccfg)
+        self._user_regs = _UserRegSet(self._user_regs)
         self.cfg = cfg
         self.reps = cfg["reps"]
         self.soft_avgs = 1
@@ -144,6 +217,8 @@ class APAveragerProgram(QickRegisterManagerMixin, AcquireMixin, QickProgram):
             self.rounds = cfg['rounds']
         self.expts = None  # abstract variable for total number of experiments in each repetition.
         self.readout_per_exp = None  # software counter for number of readouts per experiment.
+        self._ro_norms = None  # cached readout normalization parameters, see _get_ro_norms
+        self._param_reg_cache = {}  # cached pulse parameter to register conversions, see _cached_param_to_reg
         self.declare_all_gens()
         self.declare_all_readouts()
 
@@ -159,11 +234,7 @@ class APAveragerProgram(QickRegisterManagerMixin, AcquireMixin, QickProgram):
                 chs = [int(kws["ch"])]
             except TypeError:
                 chs = kws["ch"]
-            declare_kws = {}
-            exclude_args = ["ch", "skew_phase", "IQ_scale"] # for cases when two DACs are used as IQ channels on a mixer
-            for arg, v in kws.items():
-                if not (arg in exclude_args):
-                    declare_kws[arg] = v
+            declare_kws = {arg: v for arg, v in kws.items() if arg not in self._GEN_EXCLUDE_ARGS}
             for ch in chs:
                 self.declare_gen(ch, **declare_kws) # todo: all the other functions doesn't support IQ channel gen yet.. e.g. set_pulse_params, get_reg, etc
 
@@ -214,7 +285,7 @@ class APAveragerProgram(QickRegisterManagerMixin, AcquireMixin, QickProgram):
             ch_num = self.cfg["gen_chs"][gen_ch]["ch"]
         elif type(gen_ch) == int:
             ch_num = gen_ch
-        return super().get_gen_reg(ch_num, name)
+        return _bind_reg_converters(super().get_gen_reg(ch_num, name))
 
     def new_gen_reg(self, gen_ch: Union[str, int], name: str = None, init_val=None, reg_type: RegisterTypes = None,
                 tproc_reg=False) -> QickRegister:
@@ -237,7 +308,7 @@ class APAveragerProgram(QickRegisterManagerMixin, AcquireMixin, QickProgram):
             ch_num = self.cfg["gen_chs"][gen_ch]["ch"]
         elif type(gen_ch) == int:
             ch_num = gen_ch
-        return super().new_gen_reg(ch_num, name, init_val, reg_type, tproc_reg)
+        return _bind_reg_converters(super().new_gen_reg(ch_num, name, init_val, reg_type, tproc_reg))
 
     def pulse_param_to_reg(self, gen_ch, gen_ro_ch=None, **pulse_param):
         """
@@ -248,13 +319,42 @@ class APAveragerProgram(QickRegisterManagerMixin, AcquireMixin, QickProgram):
         """
         pulse_reg = pulse_param.copy()
         if "freq" in pulse_param:
-            pulse_reg["freq"] = self.soccfg.freq2reg(pulse_param["freq"], gen_ch, gen_ro_ch)
+            pulse_reg["freq"] = self._cached_param_to_reg("freq", pulse_param["freq"], gen_ch, gen_ro_ch)
         if "phase" in pulse_param:
-            pulse_reg["phase"] = self.soccfg.deg2reg(pulse_param["phase"], gen_ch)
+            pulse_reg["phase"] = self._cached_param_to_reg("phase", pulse_param["phase"], gen_ch)
         if "length" in pulse_param:
-            pulse_reg["length"] = self.soccfg.us2cycles(pulse_param["length"], gen_ch)
+            pulse_reg["length"] = self._cached_param_to_reg("length", pulse_param["length"], gen_ch)
         return pulse_reg
 
+    def _cached_param_to_reg(self, param: str, val, gen_ch, gen_ro_ch=None):
+        """
+        converts a pulse parameter from physical value to reg, the results are cached in the program so that repeated
+        parameter sets (e.g. a fixed freq/length when only the phase changes) are only converted once.
+
+        :param param: {"freq", "phase", "length"}
+        :param val: value of the parameter in its physical unit
+        :param gen_ch: generator channel number
+        :param gen_ro_ch: readout channel used for frequency matching. Only used by "freq"
+        :return: register value
+        """
+        key = (param, val, gen_ch, gen_ro_ch)
+        try:
+            return self._param_reg_cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable values are converted without caching
+            key = None
+
+        if param == "freq":
+            reg = self.soccfg.freq2reg(val, gen_ch, gen_ro_ch)
+        elif param == "phase":
+            reg = self.soccfg.deg2reg(val, gen_ch)
+        else:
+            reg = self.soccfg.us2cycles(val, gen_ch)
+        if key is not None:
+            self._param_reg_cache[key] = reg
+        return reg
+
     def set_pulse_params(self, gen_ch: str, **kwargs):
         """
         This is a wrapper of the QickProgram.set_pulse_registers. Instead of taking register values, this function takes
@@ -370,6 +470,117 @@ class APAveragerProgram(QickRegisterManagerMixin, AcquireMixin, QickProgram):
         # move the I/Q axis from last to second-last
         return [np.moveaxis(d, -1, -2) for d in buf]
 
+    def _get_ro_norms(self):
+        """
+        Get the parameters used for normalizing the accumulated data of each readout channel. They are looked up once
+        and cached, instead of being fetched from the readout and soc configs for every channel in every round.
+
+        :return: list of (length, iq_offset, ro_offset, edge_counting) of each readout channel, where iq_offset is the
+            readout IQ offset in soccfg and ro_offset is the offset returned by AcquireMixin._ro_offset.
+        """
+        if self._ro_norms is None or len(self._ro_norms) != len(self.ro_chs):
+            self._ro_norms = [(ro['length'], self.soccfg['readouts'][ch]['iq_offset'],
+                               self._ro_offset(ch, ro.get('ro_config')), ro.get('edge_counting', False))
+                              for ch, ro in self.ro_chs.items()]
+        return self._ro_norms
+
+    def _average_buf(self, d_reps, length_norm: bool = True, remove_offset: bool = True):
+        """
+        overwrites the default _average_buf method in AcquireMixin, using the cached readout normalization parameters.
+
+        :param d_reps: buffer data acquired in a round
+        :param length_norm: normalize by readout window length (ignored for readouts where edge-counting is enabled)
+        :param remove_offset: if normalizing by length, also subtract the readout's IQ offset if any
+        :return: averaged iq data after each round.
+        """
+        avg_level = self.avg_level
+        avg_d = []
+        for d, (length, _, ro_offset, edge_counting) in zip(d_reps, self._get_ro_norms()):
+            # average over the avg_level
+            avg = d.mean(axis=avg_level)
+            if length_norm and not edge_counting:
+                avg /= length
+                if remove_offset:
+                    avg -= ro_offset
+            # the reads_per_shot axis should be the first one
+            avg_d.append(np.moveaxis(avg, -2, 0))
+        return avg_d
+
+    def _process_accumulated(self, acc_buf):
+        """
+        overwrites the default _process_accumulated method in AcquireMixin. In the threshold case, the single shots are
+        averaged directly, instead of being copied into a zero buffer of the raw data shape first. The averaged Q data
+        is zero in this case.
+
+        :param acc_buf: raw accumulated IQ data of each readout channel in a round
+        :return: averaged iq data of the round.
+        """
+        params = self.acquire_params
+        if params['threshold'] is None:
+            return self._average_buf(acc_buf, length_norm=True, remove_offset=params['remove_offset'])
+
+        self.shots = self._apply_threshold(acc_buf, params['threshold'], params['angle'], params['remove_offset'])
+        avg_level = self.avg_level
+        avg_d = []
+        for ch_shot in self.shots:
+            avg_i = ch_shot.mean(axis=avg_level)
+            avg = np.zeros((*avg_i.shape, 2))
+            avg[..., 0] = avg_i
+            # the reads_per_shot axis should be the first one
+            avg_d.append(np.moveaxis(avg, -2, 0))
+        return avg_d
+
+    def _summarize_accumulated(self, rounds_buf):
+        """
+        overwrites the default _summarize_accumulated method in AcquireMixin. The averaged data of each round is summed
+        into one preallocated buffer per channel instead of stacking the data of all rounds before averaging.
+
+        :param rounds_buf: list of the averaged data of each round
+        :return: averaged iq data over all rounds.
+        """
+        n_rounds = len(rounds_buf)
+        if n_rounds == 1:
+            return [np.asarray(d, dtype=np.float64) for d in rounds_buf[0]]
+        avg_d = []
+        for i_ch in range(len(self.ro_chs)):
+            avg = np.array(rounds_buf[0][i_ch], dtype=np.float64)
+            for round_d in rounds_buf[1:]:
+                avg += round_d[i_ch]
+            avg /= n_rounds
+            avg_d.append(avg)
+        return avg_d
+
+    def _apply_threshold(self, acc_buf, threshold, angle, remove_offset):
+        """
+        overwrites the default _apply_threshold method in AcquireMixin. The rotation and threshold parameters of all
+        readout channels are prepared once before the loop, and the single shots are returned as int8 comparison
+        results instead of the float64 output of np.heaviside.
+        The length normalization and offset removal are folded into the threshold, i.e.
+        (I/L - off) * cos + (Q/L - off) * sin > thr  <=>  I * cos + Q * sin > L * (thr + off * (cos + sin)),
+        so the raw buffer is only rotated and compared, without creating normalized copies of it.
+
+        :param acc_buf: raw accumulated IQ data of each readout channel
+        :param threshold: threshold(s) on the rotated I values, in length-normalized units. Scalar or one per channel.
+        :param angle: rotation angle(s) in radians, scalar or one per channel. 0 if None.
+        :param remove_offset: subtract the readout's IQ offset, if any.
+        :return: list of single shot data of each readout channel.
+        """
+        n_ro = len(self.ro_chs)
+        if angle is None:
+            angle = 0.0
+        thresholds = np.broadcast_to(np.asarray(threshold, dtype=float), (n_ro,))
+        angles = np.broadcast_to(np.asarray(angle, dtype=float), (n_ro,))
+        rot_vecs = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+
+        shots = []
+        for i_ch, (length, iq_offset, _, _) in enumerate(self._get_ro_norms()):
+            raw_thr = thresholds[i_ch]
+            if remove_offset:
+                raw_thr = raw_thr + iq_offset * rot_vecs[i_ch].sum()
+            # same as np.heaviside(rotated - threshold, 0)
+            shots.append((np.inner(acc_buf[i_ch], rot_vecs[i_ch]) > raw_thr * length).view(np.int8))
+        return shots
+
     def measure(self, adcs, pulse_ch=None, pins=None, adc_trig_offset=270, t='auto', wait=False, syncdelay=None,
                 add_count=True):
         """Wrapper method that combines an ADC trigger, a pulse, and (optionally) the appropriate wait and a sync_all.
@@ -441,6 +652,7 @@ class NDAveragerProgram(APAveragerProgram):
         self.qick_sweeps: List[AbsQickSweep] = []
         self.expts = 1
         self.sweep_axes = []
+        self._expt_pts = None  # cached sweep points, see get_expt_pts
         self.make_program()
         # self.soft_avgs = 1
         loop_dims = [cfg['reps'], *self.sweep_axes[::-1]]
@@ -470,6 +682,7 @@ class NDAveragerProgram(APAveragerProgram):
         self.qick_sweeps.append(sweep)
         self.expts *= sweep.expts
         self.sweep_axes.append(sweep.expts)
+        self._expt_pts = None
 
     def make_program(self):
         """
@@ -490,7 +703,11 @@ class NDAveragerProgram(APAveragerProgram):
         n_sweeps = len(self.qick_sweeps)
         if n_sweeps > 5:  # to be safe, only register 17-21 in page 0 can be used as sweep counters
             raise OverflowError(f"too many qick inner loops ({n_sweeps}), run out of counter registers")
-        counter_regs = (np.arange(n_sweeps) + 17).tolist()  # not sure why this has to be a list (np.array doesn't work)
+        # counter registers must be python ints (numpy ints don't work in the asm commands)
+        counter_regs = list(range(17, 17 + n_sweeps))
+        # (counter register, sweep, loop tag, initial counter value) of each sweep, unpacked once for both loops below
+        loop_specs = [(creg, swp, f"LOOP_{swp.label if swp.label is not None else creg}", swp.expts - 1)
+                      for creg, swp in zip(counter_regs, self.qick_sweeps)]
 
         p.regwi(0, rcount, 0)  # reset total run count
 
@@ -499,10 +716,10 @@ class NDAveragerProgram(APAveragerProgram):
         p.label("LOOP_rep")
 
         # add reset and start tags for each sweep
-        for creg, swp in zip(counter_regs[::-1], self.qick_sweeps[::-1]):
+        for creg, swp, label, n_count in loop_specs[::-1]:
             swp.reset()
-            p.regwi(0, creg, swp.expts - 1)
-            p.label(f"LOOP_{swp.label if swp.label is not None else creg}")
+            p.regwi(0, creg, n_count)
+            p.label(label)
 
         # run body and total_run_counter++
         p.body()
@@ -510,9 +727,9 @@ class NDAveragerProgram(APAveragerProgram):
         p.memwi(0, rcount, 1)
 
         # add update and stop condition for each sweep
-        for creg, swp in zip(counter_regs, self.qick_sweeps):
+        for creg, swp, label, _ in loop_specs:
             swp.update()
-            p.loopnz(0, creg, f"LOOP_{swp.label if swp.label is not None else creg}")
+            p.loopnz(0, creg, label)
 
         # stop condition for repetition
         p.loopnz(0, rep_count, 'LOOP_rep')
@@ -521,15 +738,25 @@ class NDAveragerProgram(APAveragerProgram):
 
     def get_expt_pts(self):
         """
-        :return:
+        Get the sweep points of each qick sweep. The points are calculated once and cached (a copy is returned), linear
+        sweeps with the same number of points are calculated with a single vectorized np.linspace.
+
+        :return: list of sweep points, in the order the sweeps were added.
         """
-        sweep_pts = []
-        for swp in self.qick_sweeps:
-            sweep_pts.append(swp.get_sweep_pts())
-        return sweep_pts
+        if self._expt_pts is None:
+            sweeps = self.qick_sweeps
+            linear = [type(swp).get_sweep_pts is QickSweep.get_sweep_pts for swp in sweeps]
+            if len(sweeps) > 1 and all(linear) and len({swp.expts for swp in sweeps}) == 1:
+                pts = np.linspace([swp.start for swp in sweeps], [swp.stop for swp in sweeps], sweeps[0].expts, axis=-1)
+                self._expt_pts = list(pts)
+            else:
+                self._expt_pts = [swp.get_sweep_pts() for swp in sweeps]
+        # return copies, so that callers modifying the points do not change the cache
+        return [p.copy() for p in self._expt_pts]
 
     def acquire(self, soc, threshold: int = None, angle: List = None, load_pulses=True, readouts_per_experiment=None,
-                save_experiments: List = None, start_src: str = "internal", progress=False, remove_offset=True, debug=False):
+                save_experiments: List = None, start_src: str = "internal", progress=False, remove_offset=True,
+                keep_raw=True, dtype=np.float64, debug=False):
         """
         This method optionally loads pulses on to the SoC, configures the ADC readouts, loads the machine code
         representation of the AveragerProgram onto the SoC, starts the program and streams the data into the Python,
@@ -548,6 +775,10 @@ class NDAveragerProgram(APAveragerProgram):
         :param load_pulses: If true, loads pulses into the tProc
         :param start_src: "internal" (tProc starts immediately) or "external" (each round waits for an external trigger)
         :param progress: If true, displays progress bar
+        :param remove_offset: If true, subtract the readout IQ offset from the data
+        :param keep_raw: If true, keep the raw IQ data of every shot in di_buf/dq_buf (and di_buf_p/dq_buf_p). When only
+            the averaged data is needed, set to False to skip assembling the raw buffers, they will be None.
+        :param dtype: dtype of the returned averaged data, e.g. np.float32 to halve the memory of the averaged data.
         :returns:
             - expt_pts (:py:class:`list`) - list of experiment points
             - avg_di (:py:class:`list`) - list of lists of averaged accumulated I data for ADCs 0 and 1
@@ -572,39 +803,32 @@ class NDAveragerProgram(APAveragerProgram):
 
         # reformat the data into separate I and Q arrays
         # save results to class in case you want to look at it later or for analysis
-        raw = [d.reshape((-1,2)) for d in self.get_raw()]
-        if remove_offset:
-            self.di_buf = []
-            self.dq_buf = []
-            for i, (ch_key, ch_cfg) in enumerate(self.cfg['ro_chs'].items()):
-                ch = ch_cfg['ch']
-                iq_offset = self.soccfg['readouts'][ch]['iq_offset'] * ch_cfg['length']
-                d = raw[i]
-                self.di_buf.append(d[:, 0] - iq_offset)
-                self.dq_buf.append(d[:, 1] - iq_offset)
-
+        # the raw data is filled in place into preallocated, separate (n_ro, n_pts) I and Q buffers. The integer dtype
+        # of the accumulated data is kept unless the offset removal requires a cast.
+        if keep_raw:
+            raw = [d.reshape((-1, 2)) for d in self.get_raw()]
+            iq_offsets = None
+            if remove_offset:
+                iq_offsets = [iq_offset * length for length, iq_offset, _, _ in self._get_ro_norms()]
+            self.di_buf, self.dq_buf = _fill_iq_buf(raw, iq_offsets)
+            # per-rep views of the raw buffers, no copy is made
+            self.di_buf_p = self.di_buf.reshape(len(raw), self.reps, -1)
+            self.dq_buf_p = self.dq_buf.reshape(len(raw), self.reps, -1)
         else:
-            self.di_buf = [d[:,0] for d in raw]
-            self.dq_buf = [d[:,1] for d in raw]
+            self.di_buf, self.dq_buf, self.di_buf_p, self.dq_buf_p = None, None, None, None
 
         expt_pts = self.get_expt_pts()
 
-        n_ro = len(self.ro_chs)
         if save_experiments is None:
             avg_di = [d[..., 0] for d in avg_d]
             avg_dq = [d[..., 1] for d in avg_d]
         else:
-            avg_di = [np.zeros((len(save_experiments), *d.shape[1:])) for d in avg_d]
-            avg_dq = [np.zeros((len(save_experiments), *d.shape[1:])) for d in avg_d]
-            for i_ch in range(n_ro):
-                for nn, ii in enumerate(save_experiments):
-                    avg_di[i_ch][nn] = avg_d[i_ch][ii, ..., 0]
-                    avg_dq[i_ch][nn] = avg_d[i_ch][ii, ..., 1]
-
-        self.di_buf_p = np.array(self.di_buf).reshape(n_ro, self.reps, -1)
-        self.dq_buf_p = np.array(self.dq_buf).reshape(n_ro, self.reps, -1)
+            # select the saved readouts of all sweep points at once with fancy indexing
+            save_experiments = list(save_experiments)
+            avg_di = [d[save_experiments, ..., 0] for d in avg_d]
+            avg_dq = [d[save_experiments, ..., 1] for d in avg_d]
 
-        return expt_pts, np.array(avg_di), np.array(avg_dq)
+        return expt_pts, np.array(avg_di, dtype=dtype), np.array(avg_dq, dtype=dtype)
 
     # def acquire(self, soc, threshold: int = None, angle: List = None, load_pulses=True, readouts_per_experiment=None,
     #             save_experiments: List = None, start_src: str = "internal", progress=False, debug=False):
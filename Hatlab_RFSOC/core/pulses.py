@@ -1,12 +1,58 @@
+import math
 import warnings
+from functools import lru_cache
 from typing import List, Union, Type, Callable
 import numpy as np
 from qick.asm_v1 import QickProgram
 
 NumType = Union[int, float]
+# dtype used for generating the pulse envelopes in the add_* functions. The waveforms are rounded to int16 when loaded
+# to the DAC, so single precision is enough and halves the memory of the waveform math.
+ENVELOPE_DTYPE = np.float32
 
 
-def tanh_box(length: int, ramp_width: int, cut_offset=0.01, maxv=30000):
+def _min_symmetric(y, length, maxv):
+    """
+    minimum of a pulse shape that is symmetric around length/2 and monotonic on each side of it (tanh_box, gaussian).
+    For a non-negative maxv the minimum is at one of the two ends, or at the center for a tanh_box whose ramps are
+    longer than the pulse, so only those samples are compared instead of reducing over the whole array.
+    """
+    n = len(y)
+    if maxv < 0 or n == 0:
+        return np.min(y)
+    i_c = min(int(length // 2), n - 1)
+    return min(y[0], y[-1], y[i_c], y[min(i_c + 1, n - 1)])
+
+
+@lru_cache(maxsize=64)
+def _tanh_box_norm(length, ramp_width, cut_offset):
+    """
+    unit-height tanh box shape before it is scaled to maxv and shifted to zero, see tanh_box. The same shape is often
+    created repeatedly with different maxv, so it is cached on the exact (float) length, ramp width and cut offset, and
+    tanh_box only needs a multiply instead of evaluating the tanh functions again. The returned array is read-only.
+    """
+    x = np.arange(0, length)
+    c0_ = float(np.arctanh(2 * cut_offset - 1))
+    c1_ = float(np.arctanh(2 * 0.95 - 1))
+    k_ = (c1_ - c0_) / ramp_width
+    # y = (0.5 * (tanh(k_ * x + c0_) - tanh(k_ * (x - length) - c0_)) - cut_offset) / (1 - cut_offset),
+    # evaluated in place in two buffers
+    y = np.multiply(x, k_, dtype=np.float64)
+    y += c0_
+    np.tanh(y, out=y)
+    fall = np.subtract(x, length, dtype=np.float64)
+    fall *= k_
+    fall -= c0_
+    np.tanh(fall, out=fall)
+    y -= fall
+    y *= 0.5
+    y -= cut_offset
+    y /= 1 - cut_offset
+    y.flags.writeable = False
+    return y
+
+
+def tanh_box(length: int, ramp_width: int, cut_offset=0.01, maxv=30000, dtype=np.float64):
     """
     Create a numpy array containing a smooth box pulse made of two tanh functions subtract from each other.
 
@@ -14,51 +60,251 @@ def tanh_box(length: int, ramp_width: int, cut_offset=0.01, maxv=30000):
     :param ramp_width: number of points from cutOffset to 0.95 amplitude
     :param cut_offset: the initial offset to cut on the tanh Function
     :param maxv: the max value of the waveform
+    :param dtype: float dtype of the returned waveform, the waveform is always evaluated in double precision
     :return:
     """
-    x = np.arange(0, length)
-    c0_ = np.arctanh(2 * cut_offset - 1)
-    c1_ = np.arctanh(2 * 0.95 - 1)
-    k_ = (c1_ - c0_) / ramp_width
-    y = (0.5 * (np.tanh(k_ * x + c0_) - np.tanh(k_ * (x - length) - c0_)) - cut_offset) / (
-            1 - cut_offset) * maxv
-    return y - np.min(y)
+    y = np.multiply(_tanh_box_norm(length, ramp_width, cut_offset), maxv, dtype=np.float64)
+    y -= _min_symmetric(y, length, maxv)
+    return y.astype(dtype, copy=False)
+
 
+def tanh_box_batch(lengths, ramp_widths, cut_offset=0.01, maxv=30000, dtype=np.float64):
+    """
+    Create the tanh box pulses of a list of parameters at once, e.g. for the points of a pulse length sweep. The tanh
+    functions are evaluated for all the pulses in one broadcast operation instead of one tanh_box call per point.
 
-def gaussian(sigma: int, length: int, maxv=30000):
+    :param lengths: Lengths of the arrays (in points)
+    :param ramp_widths: number of points from cutOffset to 0.95 amplitude, broadcast against lengths
+    :param cut_offset: the initial offset to cut on the tanh Function, broadcast against lengths
+    :param maxv: the max value of the waveforms, broadcast against lengths
+    :param dtype: float dtype of the returned waveforms, the waveforms are always evaluated in double precision
+    :return: 2D array of shape (n_params, max_len), row i is tanh_box(lengths[i], ramp_widths[i], ...) padded with
+        zeros at the end
+    """
+    length, ramp, cut, maxv = (np.ravel(v).astype(np.float64)[:, None] for v in
+                               np.broadcast_arrays(lengths, ramp_widths, cut_offset, maxv))
+    n_pts = np.maximum(np.ceil(length[:, 0]), 0).astype(int)
+    x = np.arange(n_pts.max(initial=0))
+    c0_ = np.arctanh(2 * cut - 1)
+    c1_ = float(np.arctanh(2 * 0.95 - 1))
+    k_ = (c1_ - c0_) / ramp
+    # same in-place evaluation as _tanh_box_norm, with one row per pulse
+    y = np.multiply(x, k_)
+    y += c0_
+    np.tanh(y, out=y)
+    fall = np.subtract(x, length)
+    fall *= k_
+    fall -= c0_
+    np.tanh(fall, out=fall)
+    y -= fall
+    y *= 0.5
+    y -= cut
+    y /= 1 - cut
+    y *= maxv
+
+    # shift each pulse to zero and clear the samples beyond its length
+    outside = x >= n_pts[:, None]
+    np.copyto(fall, y)
+    fall[outside] = np.inf
+    y -= fall.min(axis=1, keepdims=True, initial=np.inf)
+    y[outside] = 0
+    return y.astype(dtype, copy=False)
+
+
+def gaussian(sigma: int, length: int, maxv=30000, dtype=np.float64):
     """
     Create a numpy array containing a Gaussian function.
 
     :param sigma: sigma (standard deviation) of Gaussian
     :param length: total number of points of gaussian pulse
     :param maxv: the max value of the waveform
+    :param dtype: float dtype of the returned waveform, the waveform is always evaluated in double precision
     :return:
     """
-    x = np.arange(0, length)
-    y = maxv * np.exp(-(x - length / 2) ** 2 / sigma ** 2)
-    y = y - np.min(y)
+    return _gaussian(np.arange(0, length), sigma, length, maxv).astype(dtype, copy=False)
+
+
+def _gaussian(x, sigma, length, maxv):
+    """
+    gaussian evaluated in double precision on the sample indices x = np.arange(0, length), so that callers that also
+    need x for a modulation can share it.
+    """
+    # y = maxv * exp(-(x - length / 2) ** 2 / sigma ** 2), evaluated in place in one buffer
+    y = np.subtract(x, length / 2, dtype=np.float64)
+    np.square(y, out=y)
+    np.negative(y, out=y)
+    y /= sigma ** 2
+    np.exp(y, out=y)
+    y *= maxv
+    y -= _min_symmetric(y, length, maxv)
+    return y
+
+
+@lru_cache(maxsize=256)
+def _tanh_box_cached(length, ramp_width, cut_offset=0.01, maxv=30000):
+    """
+    Memoized tanh_box envelope, for pulses that are added repeatedly with the same parameters. The returned array is
+    shared between callers, so it is made read-only (callers always derive new arrays from it).
+    """
+    y = tanh_box(length, ramp_width, cut_offset, maxv, dtype=ENVELOPE_DTYPE)
+    y.flags.writeable = False
+    return y
+
+
+@lru_cache(maxsize=256)
+def _gaussian_cached(sigma, length, maxv=30000):
+    """
+    Memoized gaussian envelope, see _tanh_box_cached.
+    """
+    y = gaussian(sigma, length, maxv, dtype=ENVELOPE_DTYPE)
+    y.flags.writeable = False
     return y
 
 
+def _modulation_phase(freq: float, x):
+    """
+    phase 2*pi*freq*x of a modulation with frequency freq (in units of the sampling rate) at the sample indices x.
+    """
+    return np.multiply(x, 2*np.pi * freq, dtype=np.float64)
+
+
+# the tanh box envelopes below come from the cached unit shape, so x is only built for the modulation phase
 def tanh_box_fm(freq: float, length: int, ramp_width: int, cut_offset=0.01, maxv=30000):
-    x = np.arange(0, length)
-    y = tanh_box(length, ramp_width, cut_offset, maxv) * np.cos(2*np.pi * freq * x)
+    y = _modulation_phase(freq, np.arange(0, length))
+    np.cos(y, out=y)
+    y *= tanh_box(length, ramp_width, cut_offset, maxv)
     return y
 
 
 def tanh_box_IQ(freq: float, length: int, ramp_width: int, cut_offset=0.01, maxv=30000):
-    x = np.arange(0, length)
-    i = tanh_box(length, ramp_width, cut_offset, maxv) * np.cos(2*np.pi * freq * x)
-    q = tanh_box(length, ramp_width, cut_offset, maxv) * np.sin(2*np.pi * freq * x)
+    # the envelope and the modulation phase are shared by I and Q
+    env = tanh_box(length, ramp_width, cut_offset, maxv)
+    w = _modulation_phase(freq, np.arange(0, length))
+    i = np.cos(w)
+    i *= env
+    q = np.sin(w, out=w)
+    q *= env
     return [i, q]
 
 
 def gaussian_fm(freq: float, sigma: int, length: int, maxv=30000):
     x = np.arange(0, length)
-    y = gaussian(sigma, length, maxv) * np.cos(2*np.pi * freq * x)
+    y = _modulation_phase(freq, x)
+    np.cos(y, out=y)
+    y *= _gaussian(x, sigma, length, maxv)
     return y
 
 
+def _cos_sin_deg(phase):
+    """
+    cos and sin of a scalar phase in degree, as python floats.
+
+    :param phase: phase in degree
+    :return: cos(phase), sin(phase)
+    """
+    ph = math.radians(phase)
+    return math.cos(ph), math.sin(ph)
+
+
+def _rotate_iq(wf, drag, phase):
+    """
+    rotate the complex waveform (wf + 1j * drag) by phase, i.e.
+    I = cos(phase) * wf - sin(phase) * drag, Q = sin(phase) * wf + cos(phase) * drag.
+    The drag buffer is reused as scratch space for the drag terms, so it is overwritten.
+
+    :param wf: in-phase waveform data
+    :param drag: DRAG (quadrature) waveform data, overwritten
+    :param phase: phase in degree
+    :return: I data, Q data
+    """
+    c, s = _cos_sin_deg(phase)
+    idata = np.multiply(wf, c)
+    qdata = np.multiply(wf, s)
+    drag_c = np.multiply(drag, c)
+    drag *= s
+    idata -= drag
+    qdata += drag_c
+    return idata, qdata
+
+
+def _to_dac_int16(data, soc_gencfg):
+    """
+    round float waveform data to the int16 DAC samples that qick loads, in place in the float buffer. The samples are
+    range checked against the generator maxv before rounding, the same check (and error) as in qick's add_envelope.
+
+    :param data: float waveform data, overwritten
+    :param soc_gencfg: gen_ch config
+    :return: int16 waveform data
+    """
+    peak = np.max(np.abs(data))
+    if peak > soc_gencfg['maxv']:
+        raise ValueError("max abs val of envelope (%d) exceeds limit (%d)" % (peak, soc_gencfg['maxv']))
+    np.rint(data, out=data)
+    return data.astype(np.int16)
+
+
+def _central_diff(a):
+    """
+    Derivative of a uniformly sampled waveform, same as np.gradient(a) with unit spacing (central difference inside,
+    first order one-sided differences at the edges), without the generic spacing handling of np.gradient.
+
+    :param a: waveform data, at least 2 points
+    :return:
+    """
+    a = _as_float_array(a)
+    g = np.empty_like(a)
+    np.subtract(a[2:], a[:-2], out=g[1:-1])
+    g[1:-1] *= 0.5
+    g[0] = a[1] - a[0]
+    g[-1] = a[-1] - a[-2]
+    return g
+
+
+def _as_float_array(data):
+    """
+    converts waveform data to a float array, float inputs keep their precision.
+    """
+    data = np.asarray(data)
+    return data.astype(np.result_type(data, ENVELOPE_DTYPE), copy=False)
+
+
+def _pad16(data):
+    """
+    pad zeros at the end of the waveform data so that the length is a multiple of 16 samples.
+    """
+    data = _as_float_array(data)
+    return np.pad(data, (0, -len(data) % 16))
+
+
+def _gen_cfg(prog: QickProgram, gen_ch):
+    """
+    get the generator config used for building pulses on gen_ch. The result is cached on the program, so the config
+    dicts are only looked up once per generator, call reset_gen_cache if the program config is changed afterwards.
+
+    :param prog: QickProgram
+    :param gen_ch: name of the generator channel in prog.cfg["gen_chs"], or the generator index
+    :return: generator index, soc gen config, samps_per_clk, f_fabric, default maxv
+    """
+    cache = prog.__dict__.setdefault('_hatlab_gen_cache', {})
+    try:
+        return cache[gen_ch]
+    except KeyError:
+        pass
+    ch = prog.cfg["gen_chs"][gen_ch]["ch"] if isinstance(gen_ch, str) else gen_ch
+    soc_gencfg = prog.soccfg['gens'][ch]
+    cfg = (ch, soc_gencfg, soc_gencfg['samps_per_clk'], soc_gencfg['f_fabric'],
+           soc_gencfg['maxv'] * soc_gencfg['maxv_scale'])
+    cache[gen_ch] = cfg
+    return cfg
+
+
+def reset_gen_cache(prog: QickProgram):
+    """
+    clear the generator configs cached on prog by the add_* pulse functions.
+    """
+    prog.__dict__.pop('_hatlab_gen_cache', None)
+
+
 def add_padding(data, soc_gencfg, padding):
     """
     pad some zeros before and/or after the waveform data
@@ -71,13 +317,10 @@ def add_padding(data, soc_gencfg, padding):
     fclk = soc_gencfg['f_fabric']
 
     if isinstance(padding, int | float):
-        padding = np.array([0, padding])
+        n0, n1 = 0, int(np.ceil(padding * fclk * samps_per_clk))
     else:
-        padding = np.array(padding)
-    padding_samp = np.ceil(padding * fclk * samps_per_clk)
-    data = np.concatenate((np.zeros(int(padding_samp[0])), data, np.zeros(int(padding_samp[1]))))
-
-    return data
+        n0, n1 = np.ceil(np.array(padding) * fclk * samps_per_clk).astype(int)
+    return np.pad(_as_float_array(data), (n0, n1))
 
 
 def add_tanh(prog: QickProgram, gen_ch, name, length: float, ramp_width: float, cut_offset: float = 0.01,
@@ -107,12 +350,9 @@ def add_tanh(prog: QickProgram, gen_ch, name, length: float, ramp_width: float,
 
     """
 
-    gen_ch = prog.cfg["gen_chs"][gen_ch]["ch"]
-    soc_gencfg = prog.soccfg['gens'][gen_ch]
+    gen_ch, soc_gencfg, samps_per_clk, fclk, maxv_default = _gen_cfg(prog, gen_ch)
     if maxv is None:
-        maxv = soc_gencfg['maxv'] * soc_gencfg['maxv_scale']
-    samps_per_clk = soc_gencfg['samps_per_clk']
-    fclk = soc_gencfg['f_fabric']
+        maxv = maxv_default
 
     # length_cyc = prog.us2cycles(length, gen_ch=gen_ch)
     length_cyc = length * fclk
@@ -120,18 +360,18 @@ def add_tanh(prog: QickProgram, gen_ch, name, length: float, ramp_width: float,
     # ramp_reg = np.int64(np.round(ramp_width*fclk*samps_per_clk))
     ramp_reg = ramp_width * fclk * samps_per_clk
 
-    wf = tanh_box(length_reg, ramp_reg, cut_offset, maxv=maxv)
+    wf = _tanh_box_cached(length_reg, ramp_reg, cut_offset, maxv=maxv)
     if padding is not None:
         wf = add_padding(wf, soc_gencfg, padding)
-    zero_padding = np.zeros((16 - len(wf)) % 16)
-    wf_padded = np.concatenate((wf, zero_padding))
-    drag_padded = -np.gradient(wf_padded) * drag
+    wf_padded = _pad16(wf)
+    drag_padded = _central_diff(wf_padded)
+    drag_padded *= -drag
 
-    wf_idata = np.cos(np.pi / 180 * phase) * wf_padded - np.sin(np.pi / 180 * phase) * drag_padded
-    wf_qdata = np.sin(np.pi / 180 * phase) * wf_padded + np.cos(np.pi / 180 * phase) * drag_padded
+    wf_idata, wf_qdata = _rotate_iq(wf_padded, drag_padded, phase)
 
     # prog.add_pulse(gen_ch, name, idata=wf_padded)
-    prog.add_pulse(gen_ch, name, idata=wf_idata, qdata=wf_qdata)
+    prog.add_pulse(gen_ch, name, idata=_to_dac_int16(wf_idata, soc_gencfg),
+                  qdata=_to_dac_int16(wf_qdata, soc_gencfg))
 
 
 def add_gaussian(prog: QickProgram, gen_ch: str, name, sigma: float, length: float, phase: float = 0,
@@ -154,30 +394,27 @@ def add_gaussian(prog: QickProgram, gen_ch: str, name, sigma: float, length: flo
 
     """
 
-    gen_ch = prog.cfg["gen_chs"][gen_ch]["ch"]
-    soc_gencfg = prog.soccfg['gens'][gen_ch]
+    gen_ch, soc_gencfg, samps_per_clk, fclk, maxv_default = _gen_cfg(prog, gen_ch)
     if maxv is None:
-        maxv = soc_gencfg['maxv'] * soc_gencfg['maxv_scale']
-    samps_per_clk = soc_gencfg['samps_per_clk']
-    fclk = soc_gencfg['f_fabric']
+        maxv = maxv_default
 
     # length_cyc = prog.us2cycles(length, gen_ch=gen_ch)
     length_cyc = length * fclk
     length_reg = length_cyc * samps_per_clk
     sigma_reg = sigma * fclk * samps_per_clk
 
-    wf = gaussian(sigma_reg, length_reg, maxv=maxv)
+    wf = _gaussian_cached(sigma_reg, length_reg, maxv=maxv)
     if padding is not None:
         wf = add_padding(wf, soc_gencfg, padding)
-    zero_padding = np.zeros((16 - len(wf)) % 16)
-    wf_padded = np.concatenate((wf, zero_padding))
-    drag_padded = -np.gradient(wf_padded) * drag
+    wf_padded = _pad16(wf)
+    drag_padded = _central_diff(wf_padded)
+    drag_padded *= -drag
 
-    wf_idata = np.cos(np.pi / 180 * phase) * wf_padded - np.sin(np.pi / 180 * phase) * drag_padded
-    wf_qdata = np.sin(np.pi / 180 * phase) * wf_padded + np.cos(np.pi / 180 * phase) * drag_padded
+    wf_idata, wf_qdata = _rotate_iq(wf_padded, drag_padded, phase)
 
     # prog.add_pulse(gen_ch, name, idata=wf_padded)
-    prog.add_pulse(gen_ch, name, idata=wf_idata, qdata=wf_qdata)
+    prog.add_pulse(gen_ch, name, idata=_to_dac_int16(wf_idata, soc_gencfg),
+                  qdata=_to_dac_int16(wf_qdata, soc_gencfg))
 
 
 def add_arbitrary(prog: QickProgram, gen_ch: str, name, envelope, phase: float = 0,
@@ -197,73 +434,69 @@ def add_arbitrary(prog: QickProgram, gen_ch: str, name, envelope, phase: float =
         Value at the peak (if None, the max value for this generator will be used)
 
     """    
-    gen_ch = prog.cfg["gen_chs"][gen_ch]["ch"]
-    soc_gencfg = prog.soccfg['gens'][gen_ch]
+    gen_ch, soc_gencfg = _gen_cfg(prog, gen_ch)[:2]
 
     wf = envelope
 
     if padding is not None:
         wf = add_padding(wf, soc_gencfg, padding)
-    zero_padding = np.zeros((16 - len(wf)) % 16)
-    wf_padded = np.concatenate((wf, zero_padding))
-    drag_padded = -np.gradient(wf_padded) * drag
+    wf_padded = _pad16(wf)
+    drag_padded = _central_diff(wf_padded)
+    drag_padded *= -drag
 
-    wf_idata = np.cos(np.pi / 180 * phase) * drag_padded
-    wf_qdata = np.sin(np.pi / 180 * phase) * drag_padded
+    wf_idata, wf_qdata = _rotate_iq(wf_padded, drag_padded, phase)
 
     # prog.add_pulse(gen_ch, name, idata=wf_padded)
-    prog.add_pulse(gen_ch, name, idata=wf_idata, qdata=wf_qdata)
+    prog.add_pulse(gen_ch, name, idata=_to_dac_int16(wf_idata, soc_gencfg),
+                  qdata=_to_dac_int16(wf_qdata, soc_gencfg))
 
 
 def add_pulse_concatenate(prog: QickProgram, gen_ch: str | int, name, gatelist, maxv=None):
-    def get_gain_max(gatelist):
-        gmax = 0
-        for gate in gatelist:
-            gmax = gate['gain'] if gate['gain'] > gmax else gmax
-        return gmax
-    gen_ch = prog.cfg["gen_chs"][gen_ch]["ch"] if type(gen_ch) == str else gen_ch
-    soc_gencfg = prog.soccfg['gens'][gen_ch]
+    gen_ch, soc_gencfg, samps_per_clk, fclk, maxv_default = _gen_cfg(prog, gen_ch)
     if maxv is None:
-        maxv = soc_gencfg['maxv'] * soc_gencfg['maxv_scale']
-    samps_per_clk = soc_gencfg['samps_per_clk']
-    fclk = soc_gencfg['f_fabric']
+        maxv = maxv_default
 
-    wfdata_i = []
-    wfdata_q = []
-    wf_len_list = []
-    gmax = get_gain_max(gatelist)
+    # first pass: build the envelope of each gate, so that the total length of the concatenated waveform is known
+    gmax = max([0] + [gate['gain'] for gate in gatelist])
+    envelopes = []
     for gate in gatelist:
         maxv_p = gate.get('maxv', maxv)
         if gate['shape'] == 'gaussian':
             length_reg = gate['length'] * fclk * samps_per_clk
             sigma_reg = gate['sigma'] * fclk * samps_per_clk
-            pulsedata = gate['gain'] / gmax * gaussian(sigma_reg, length_reg, maxv=maxv_p)
+            pulsedata = gate['gain'] / gmax * _gaussian_cached(sigma_reg, length_reg, maxv=maxv_p)
 
         elif gate['shape'] == 'tanh_box':
             length_reg = gate['length'] * fclk * samps_per_clk
             ramp_reg = gate['ramp_width'] * fclk * samps_per_clk
-            pulsedata = gate['gain'] / gmax * tanh_box(length_reg, ramp_reg, maxv=maxv_p)
+            pulsedata = gate['gain'] / gmax * _tanh_box_cached(length_reg, ramp_reg, maxv=maxv_p)
 
         else:
             raise NameError(f"unsupported pulse shape {gate['shape']}")
 
         padding = gate.get('padding')
-        if gate['padding'] is not None:
+        if padding is not None:
             pulsedata = add_padding(pulsedata, soc_gencfg, padding)
+        envelopes.append(pulsedata)
 
-        wfdata_i = np.concatenate((wfdata_i, pulsedata * np.cos(gate['phase'] / 360 * 2 * np.pi)))
-        wfdata_q = np.concatenate((wfdata_q, pulsedata * np.sin(gate['phase'] / 360 * 2 * np.pi)))
-        zero_padding = np.zeros((16 - len(wfdata_i)) % 16)
-        wfdata_i = np.concatenate((wfdata_i, zero_padding))
-        wfdata_q = np.concatenate((wfdata_q, zero_padding))
-        # print("gate phase: ", gate['phase'])
-        # wf_len_list.append(len(wfdata_i) / 16.0)
-
-    # print(wf_len_list)
-    if len(wfdata_i) == 0:
+    total_len = sum(-(-len(env) // 16) * 16 for env in envelopes)
+    if total_len == 0:
         prog.add_pulse(gen_ch, name, idata=3 * [0] * samps_per_clk, qdata=3 * [0] * samps_per_clk)
-    else:
-        prog.add_pulse(gen_ch, name, idata=wfdata_i, qdata=wfdata_q)
+        return
+
+    # second pass: fill the preallocated I/Q data, each gate starts at a multiple of 16 samples
+    wfdata_i = np.zeros(total_len, dtype=np.result_type(*envelopes))
+    wfdata_q = np.zeros(total_len, dtype=wfdata_i.dtype)
+    offset = 0
+    for gate, env in zip(gatelist, envelopes):
+        c, s = _cos_sin_deg(gate['phase'])
+        n = len(env)
+        np.multiply(env, c, out=wfdata_i[offset:offset + n])
+        np.multiply(env, s, out=wfdata_q[offset:offset + n])
+        offset += -(-n // 16) * 16
+
+    prog.add_pulse(gen_ch, name, idata=_to_dac_int16(wfdata_i, soc_gencfg),
+                  qdata=_to_dac_int16(wfdata_q, soc_gencfg))
 
 
 # class WaveformRegistry:
@@ -396,12 +629,16 @@ class ChirpModulationMixin:
 
     @staticmethod
     def _chirp_phase(instant_freq, sampling_rate):
-        phase = np.zeros(len(instant_freq))
-        phi0 = 0
-        for i in range(len(instant_freq) - 1):
-            phase[i] = phi0
-            phi0 += np.pi * (instant_freq[i] + instant_freq[i + 1]) / sampling_rate
-        phase[-1] = phi0
+        # trapezoidal integration of the instantaneous frequency, phase[0] = 0. The phase increments are computed in
+        # the output buffer and accumulated in place, so no temporary arrays are created.
+        instant_freq = np.asarray(instant_freq, dtype=np.float64)
+        phase = np.empty(len(instant_freq))
+        phase[0] = 0
+        increments = phase[1:]
+        np.add(instant_freq[:-1], instant_freq[1:], out=increments)
+        increments *= np.pi
+        increments /= sampling_rate
+        np.cumsum(increments, out=increments)
         return phase
 
     @staticmethod
@@ -418,7 +655,13 @@ class ChirpModulationMixin:
         """
         chirp_freq = ChirpModulationMixin._instant_frequency(chirp_func, waveform, maxf, maxv)
         chirp_phase = ChirpModulationMixin._chirp_phase(chirp_freq, sampling_rate)
-        wf_chirp = waveform * np.exp(1j * chirp_phase)
+        # waveform * exp(1j * phase), with cos and sin written straight into the real and imaginary parts of the
+        # output buffer
+        waveform = np.asarray(waveform)
+        wf_chirp = np.empty(len(chirp_phase), dtype=np.result_type(waveform, np.complex128))
+        np.cos(chirp_phase, out=wf_chirp.real)
+        np.sin(chirp_phase, out=wf_chirp.imag)
+        wf_chirp *= waveform
 
         return wf_chirp
 # 
@@ -1,6 +1,9 @@
+import math
 import warnings
+from functools import lru_cache
 from typing import List, Dict, Union
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import h5py
 import yaml
@@ -10,6 +13,10 @@ from plottr.data.datadict_storage import set_attr as dd_set_attr
 from Hatlab_DataProcessing.data_saving import datadict_from_hdf5, HatDDH5Writer
 from Hatlab_RFSOC.helpers.yaml_editor import to_yaml_friendly
 
+# minimum number of data points per ro_ch in QickDataDict.add_data for processing the ro_chs in parallel threads
+PARALLEL_MIN_POINTS = 10_000
+
+
 def add_axis_meta(dd:Union[DataDictBase, Dict], ax_name: str, ax_value):
     """
     add the values of a sweep axis as metadata (hdf5 header attribute) for easier access in data loading
@@ -145,17 +152,34 @@ class QickDataDict(DataDict):
         expts = len(list(flatten_inner.values())[0]) if flatten_inner != {} else 1  # total inner sweep points
 
         # add msmt index data
-        new_data["msmts"] = np.tile(range(msmt_per_exp), expts * reps)
+        new_data["msmts"] = np.tile(np.arange(msmt_per_exp), expts * reps)
         add_axis_meta(self, "msmts", np.arange(msmt_per_exp))
 
 
         # add iq data
-        for i, ch in enumerate(self.ro_chs):
-            new_data[f"avg_iq_{ch}"] = np.tile((avg_i[i] + 1j * avg_q[i]).transpose().flatten(), reps)
-            if buf_i is not None:
-                new_data[f"buf_iq_{ch}"] = (buf_i[i] + 1j * buf_q[i]).flatten()
+        avg_i, avg_q = np.asarray(avg_i), np.asarray(avg_q)
+        if buf_i is not None:
+            buf_i, buf_q = np.asarray(buf_i), np.asarray(buf_q)
+
+        def channel_iq(i):
+            avg_iq = np.tile(_to_complex(avg_i[i], avg_q[i]).ravel(order="F"), reps)
+            buf_iq = None if buf_i is None else _to_complex(buf_i[i], buf_q[i]).ravel()
+            return avg_iq, buf_iq
+
+        # the channels are independent and numpy releases the GIL, so large data are processed in one thread per ro_ch
+        if len(self.ro_chs) > 1 and msmt_per_exp * expts * reps >= PARALLEL_MIN_POINTS:
+            with ThreadPoolExecutor(max_workers=len(self.ro_chs)) as executor:
+                channel_data = list(executor.map(channel_iq, range(len(self.ro_chs))))
+        else:
+            channel_data = map(channel_iq, range(len(self.ro_chs)))
+
+        for ch, (avg_iq, buf_iq) in zip(self.ro_chs, channel_data):
+            new_data[f"avg_iq_{ch}"] = avg_iq
+            if buf_iq is not None:
+                new_data[f"buf_iq_{ch}"] = buf_iq
             else:
-                new_data[f"buf_iq_{ch}"] = np.zeros(msmt_per_exp * expts)
+                # placeholder when the buffers are not saved, a read-only zero view instead of a new zero array
+                new_data[f"buf_iq_{ch}"] = np.broadcast_to(0.0, msmt_per_exp * expts)
 
         # add qick repeat index data
         new_data["reps"] = np.repeat(np.arange(reps), msmt_per_exp * expts)
@@ -165,25 +189,67 @@ class QickDataDict(DataDict):
         # for k, v in flatten_inner.items():
         #     new_data[k] = np.tile(np.repeat(v, msmt_per_exp), reps)
 
+        # the inner sweep values are repeated for each rep and each outer sweep point, in one tile
+        inner_tiles = reps * math.prod(len(vo) for vo in outer_sweeps.values())
         for ki, vi in flatten_inner.items():
-            new_data[ki] = np.tile(np.repeat(vi, msmt_per_exp), reps)
-            for ko, vo in outer_sweeps.items():
-                new_data[ki] = np.tile(new_data[ki], len(vo))
+            new_data[ki] = np.tile(np.repeat(vi, msmt_per_exp), inner_tiles)
 
         # add outer sweep data
         for k, v in outer_sweeps.items():
             new_data[k] = np.repeat([v], msmt_per_exp * expts * reps)
 
         # add soft repeat index data
-        new_data["soft_reps"] = np.repeat([soft_rep], msmt_per_exp * expts * reps)
+        new_data["soft_reps"] = np.full(msmt_per_exp * expts * reps, soft_rep)
         add_axis_meta(self, "soft_reps",  np.arange(soft_rep + 1))
 
         super().add_data(**new_data)
 
 
+def _to_complex(i_data, q_data):
+    """
+    combine I and Q data into one complex array, same as i_data + 1j * q_data but without the temporary arrays.
+    """
+    i_data, q_data = np.asarray(i_data), np.asarray(q_data)
+    iq = np.empty(np.broadcast_shapes(i_data.shape, q_data.shape), dtype=np.result_type(i_data, q_data, np.complex64))
+    iq.real = i_data
+    iq.imag = q_data
+    return iq
+
+
+def _flatten_sweep_values(vals: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    flatten the 1d sweep value arrays of a square sweep, see flatten_sweep_dict.
+    """
+    # same order as flattening np.meshgrid(*values) (default "xy" indexing, so the second axis varies slowest, then
+    # the first, third, ...), but each axis is built with repeat/tile from the axis sizes instead of materializing the
+    # full grid of every axis at once
+    grid_order = list(range(len(vals)))
+    if len(vals) > 1:
+        grid_order[:2] = [1, 0]
+    grid_sizes = [len(vals[j]) for j in grid_order]
+
+    sweep_vals = [None] * len(vals)
+    for p, j in enumerate(grid_order):
+        n_inner, n_outer = math.prod(grid_sizes[p + 1:]), math.prod(grid_sizes[:p])
+        sweep_vals[j] = np.tile(np.repeat(vals[j], n_inner), n_outer)
+    return sweep_vals
+
+
+@lru_cache(maxsize=16)
+def _flatten_sweep_values_cached(key) -> List[np.ndarray]:
+    """
+    _flatten_sweep_values keyed on the (dtype, bytes) of each sweep value array. The returned arrays are shared
+    between callers, so they are made read-only.
+    """
+    sweep_vals = _flatten_sweep_values([np.frombuffer(b, dtype=dt) for dt, b in key])
+    for v in sweep_vals:
+        v.flags.writeable = False
+    return sweep_vals
+
+
 def flatten_sweep_dict(sweeps: Union[DataDictBase, Dict]):
     """
-    Flatten a square sweep dictionary to 1d arrays.
+    Flatten a square sweep dictionary to 1d arrays. The flattened arrays are cached and read-only.
 
     :param sweeps: dictionary of sweep variable arrays
     :return:
@@ -193,10 +259,16 @@ def flatten_sweep_dict(sweeps: Union[DataDictBase, Dict]):
     except AttributeError:
         py_dict = sweeps
 
+    vals = [np.ravel(v) for v in py_dict.values()]
+    if any(v.dtype.hasobject for v in vals):
+        sweep_vals = _flatten_sweep_values(vals)
+    else:
+        # the same sweep values are usually flattened again for every add_data, cache the result on their content
+        sweep_vals = _flatten_sweep_values_cached(tuple((v.dtype.str, v.tobytes()) for v in vals))
+
     flatten_sweeps = {}
-    sweep_vals = map(np.ndarray.flatten, np.meshgrid(*py_dict.values()))
-    for k in sweeps.keys():
-        flatten_sweeps[k] = next(sweep_vals)
+    for k, v in zip(sweeps.keys(), sweep_vals):
+        flatten_sweeps[k] = v
     return flatten_sweeps
 
 def dict_to_datadict(d:Dict):
@@ -252,8 +324,9 @@ def get_config_info(datapath: str):
     """
     filename = datapath.split("\\")[-1][:-5]
     filepath = "\\".join(datapath.split("\\")[:-1]) + "\\"
-    config = yaml.safe_load(open(datapath[:-5] + "_cfg.yaml"))["config"]
-    info = yaml.safe_load(open(datapath[:-5] + "_cfg.yaml"))["info"]
+    with open(datapath[:-5] + "_cfg.yaml", "rb") as f:
+        cfg = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    config, info = cfg["config"], cfg["info"]
 
     return config, info 
 
@@ -333,7 +406,8 @@ class DataFromQDDH5:
             except KeyError:
                 pass
 
-        data_r = np.array(data["values"]).reshape(*data_shape)
+        # the loaded values are usually an ndarray already, reshape them as a view instead of copying
+        data_r = np.asarray(data["values"]).reshape(*data_shape)
         self.datashape = list(data_r.shape)
 
         return data_r
@@ -345,8 +419,8 @@ class DataFromQDDH5:
         """
         rep_idx = self.axes_names.index("reps")
         for k, v in self.avg_iq.items():
-            v = np.moveaxis(v, rep_idx, 1)
-            self.avg_iq[k] = np.average(v.reshape(-1, *v.shape[2:]), axis=0)
+            # average over soft_reps (axis 0) and reps in one reduction
+            self.avg_iq[k] = v.mean(axis=(0, rep_idx))
         for k, v in self.buf_iq.items():
             v = np.moveaxis(v, rep_idx, 1)
             self.buf_iq[k] = v.reshape(-1, *v.shape[2:])
@@ -47,7 +47,7 @@ class Experiment():
         self.ddw = None
 
     def run(self, save_data=True, save_buf=False, readouts_per_experiment=None, save_experiments: List = None,
-            new_inner: Union[DataDictBase, Dict] = None, soft_rep=0, inner_progress=True, **outer_vals):
+            new_inner: Union[DataDictBase, Dict] = None, soft_rep=0, inner_progress=True, keep_raw=True, **outer_vals):
         """
         run qick program and save data. By default, after each run, the new data will be appended to the same data file.
 
@@ -58,6 +58,8 @@ class Experiment():
         :param new_inner: the inner sweep dictionary can be updated in each run.
         :param soft_rep: index of soft repeat (average loop done in python)
         :param inner_progress: when True, show the progress bar fo the qick inner sweep
+        :param keep_raw: when True, keep the raw IQ buffers in self.prog (di_buf, dq_buf, di_buf_p, dq_buf_p) after the
+            run. When False, they are only assembled if they are saved (save_buf) or returned (save_data=False).
         :param outer_vals: the values of the outer sweep used in this run
         :return:
         """
@@ -76,7 +78,8 @@ class Experiment():
         self.prog = self.program(self.soccfg, self.cfg)
         x_pts, avgi, avgq = self.prog.acquire(self.soc, load_pulses=True, progress=inner_progress, debug=False,
                                               readouts_per_experiment=readouts_per_experiment,
-                                              save_experiments=save_experiments)
+                                              save_experiments=save_experiments,
+                                              keep_raw=keep_raw or save_buf or not save_data)
 
         ## run program (and save data)
         if save_data:
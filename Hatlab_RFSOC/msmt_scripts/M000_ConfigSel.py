@@ -3,7 +3,10 @@ cfgFilePath = "./config_files/example_config.yml"
 
 
 import yaml
+# use the libyaml based loader when pyyaml is built with it
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 def get_cfg_info():
-    yml = yaml.safe_load(open(cfgFilePath))
+    with open(cfgFilePath, "rb") as f:
+        yml = yaml.load(f, Loader=SafeLoader)
     config, info = yml["config"], yml["info"]
     return config, info
\ No newline at end of file
@@ -7,6 +7,21 @@ import matplotlib.pyplot as plt
 NumType = Union[int, float]
 
 
+def _in_range_func(interpolation):
+    """
+    wraps the interpolation of calibration data, so that it returns 1 for values outside the calibrated frequency range.
+    The interpolation must be built with extrapolate=False, so that it returns nan outside the calibrated range.
+    """
+    def calib_func(val):
+        val_array = np.atleast_1d(val)  # Ensure val is treated as a numpy array.
+        # For values within the calibrated range, use the interpolation function. Otherwise, return 1
+        result = np.nan_to_num(interpolation(val_array), nan=1.0)
+        if result.size == 1:
+            return result.item()  # Return a scalar if the input was a scalar.
+        return result
+    return calib_func
+
+
 class DragModulation:
     def __init__(self, drag_factor, drag_func: Callable = None):
         """
@@ -53,12 +68,16 @@ class ChirpModulation:
 
     @staticmethod
     def _chirp_phase(instant_freq, sampling_rate):
-        phase = np.zeros(len(instant_freq))
-        phi0 = 0
-        for i in range(len(instant_freq) - 1):
-            phase[i] = phi0
-            phi0 += np.pi * (instant_freq[i] + instant_freq[i + 1]) / sampling_rate
-        phase[-1] = phi0
+        # trapezoidal integration of the instantaneous frequency, phase[0] = 0. The phase increments are computed in
+        # the output buffer and accumulated in place, so no temporary arrays are created.
+        instant_freq = np.asarray(instant_freq, dtype=np.float64)
+        phase = np.empty(len(instant_freq))
+        phase[0] = 0
+        increments = phase[1:]
+        np.add(instant_freq[:-1], instant_freq[1:], out=increments)
+        increments *= np.pi
+        increments /= sampling_rate
+        np.cumsum(increments, out=increments)
         return phase
 
     def apply_modulation(self, waveform, sampling_rate):
@@ -206,48 +225,31 @@ class WaveformCorrection:
             freq_MHz = self.calibration_data[0]
             S21_dbm = self.calibration_data[1]
             S21_interpolate = CubicSpline(freq_MHz, S21_dbm + attenuation)
-            interpolation = CubicSpline(freq_MHz, 10 ** ((-S21_dbm + S21_interpolate(freq_ref)) / 10))
+            interpolation = CubicSpline(freq_MHz, 10 ** ((-S21_dbm + S21_interpolate(freq_ref)) / 10),
+                                        extrapolate=False)
         elif self.scale.lower() == "linear":
             freq_MHz = self.calibration_data[0]
             S21 = self.calibration_data[1]
             S21_interpolate = CubicSpline(freq_MHz, S21 + attenuation)
-            interpolation = CubicSpline(freq_MHz, + S21_interpolate(freq_ref)/S21)
-
-        def calib_func(val):
-            f_min = np.min(freq_MHz)
-            f_max = np.max(freq_MHz)
-            val_array = np.atleast_1d(val)  # Ensure val is treated as a numpy array.
-            mask = (val_array >= f_min) & (val_array <= f_max)  # Create a mask for values within the range.
-            # For values within the calibrated range, use the interpolation function. Otherwise, return 1
-            result = np.where(mask, interpolation(val_array), 1)
-            if result.size == 1:
-                return result.item()  # Return a scalar if the input was a scalar.
-            return result
-        return calib_func
+            interpolation = CubicSpline(freq_MHz, + S21_interpolate(freq_ref)/S21, extrapolate=False)
+
+        return _in_range_func(interpolation)
 
     def get_recover_func(self, freq_ref, attenuation):
         from scipy.interpolate import CubicSpline
-        if self.scale.lower() in ["db", "dbm"]:
+        if self.scale.lower() in ["db", "dbm", "log"]:
             freq_MHz = self.calibration_data[0]
             S21_dbm = self.calibration_data[1]
             S21_interpolate = CubicSpline(freq_MHz, S21_dbm + attenuation)
-            interpolation = CubicSpline(freq_MHz, 10 ** ((S21_dbm - S21_interpolate(freq_ref)) / 10))
+            interpolation = CubicSpline(freq_MHz, 10 ** ((S21_dbm - S21_interpolate(freq_ref)) / 10),
+                                        extrapolate=False)
         elif self.scale.lower() == "linear":
             freq_MHz = self.calibration_data[0]
             S21 = self.calibration_data[1]
             S21_interpolate = CubicSpline(freq_MHz, S21 + attenuation)
-            interpolation = CubicSpline(freq_MHz, + S21/S21_interpolate(freq_ref))
-
-        def calib_func(val):
-            f_min = np.min(freq_MHz)
-            f_max = np.max(freq_MHz)
-            val_array = np.atleast_1d(val)  # Ensure val is treated as a numpy array.
-            mask = (val_array >= f_min) & (val_array <= f_max)  # Create a mask for values within the range.
-            result = np.where(mask, interpolation(val_array), 1)  # For values within the calibrated range, use the interpolation function. Otherwise, return 1
-            if result.size == 1:
-                return result.item()  # Return a scalar if the input was a scalar.
-            return result
-        return calib_func
+            interpolation = CubicSpline(freq_MHz, + S21/S21_interpolate(freq_ref), extrapolate=False)
+
+        return _in_range_func(interpolation)
 
     def plot_calibration(self, ax=None):
         if ax is None:
@@ -1,4 +1,6 @@
+import math
 import warnings
+from functools import lru_cache
 from typing import List, Union, Type, Callable
 import numpy as np
 from qick.asm_v1 import QickProgram
@@ -8,12 +10,68 @@ import matplotlib.pyplot as plt
 NumType = Union[int, float]
 
 
+@lru_cache(maxsize=128)
+def _gaussian_core(length: float, sigma: float) -> np.ndarray:
+    """
+    the definetion of Gaussian, see Gaussian.core. Pulses with the same shape are often created repeatedly with only
+    a different phase or maxv (e.g. in sweeps), so the shape is cached. The returned array is shared and read-only.
+    """
+    t = np.arange(length)
+    y = np.exp(-(t - length / 2) ** 2 / sigma ** 2)
+    y = y - np.min(y)
+    y.flags.writeable = False
+    return y
+
+
+@lru_cache(maxsize=128)
+def _tanhbox_core(length: float, ramp_width: float, cut_offset: float) -> np.ndarray:
+    """
+    smooth box pulse made of two tanh functions, see TanhBox.core. Cached like _gaussian_core, the returned array is
+    shared and read-only.
+    """
+    t = np.arange(length)
+    c0_, c1_ = np.arctanh(2 * cut_offset - 1), np.arctanh(2 * 0.95 - 1)
+    k_ = (c1_ - c0_) / ramp_width
+    # y = (0.5 * (tanh(k_ * t + c0_) - tanh(k_ * (t - length) - c0_)) - cut_offset) / (1 - cut_offset),
+    # evaluated in place in two buffers
+    y = np.multiply(t, k_, dtype=np.float64)
+    y += c0_
+    np.tanh(y, out=y)
+    fall = np.subtract(t, length, dtype=np.float64)
+    fall *= k_
+    fall -= c0_
+    np.tanh(fall, out=fall)
+    y -= fall
+    y *= 0.5
+    y -= cut_offset
+    y /= 1 - cut_offset
+    y -= np.min(y)
+    y.flags.writeable = False
+    return y
+
+
+def _load_columns(filepath, **kwargs) -> np.ndarray:
+    """
+    load a whitespace separated text file of numbers as a 2D array, same as np.loadtxt(filepath). When no np.loadtxt
+    kwargs are given and pandas is installed, the faster pandas C parser is used.
+    """
+    if not kwargs:
+        try:
+            import pandas as pd
+        except ImportError:
+            pass
+        else:
+            return pd.read_csv(filepath, header=None, sep=r"\s+", comment="#", dtype=np.float64).to_numpy()
+    return np.loadtxt(filepath, **kwargs)
+
+
 class WaveformRegistry:
     _registry = {}
 
     @classmethod
     def register(cls, shape: str, waveform_cls: Type['Waveform']):
-        cls._registry[shape] = waveform_cls
+        if cls._registry.get(shape) is not waveform_cls:
+            cls._registry[shape] = waveform_cls
 
     @classmethod
     def create(cls, shape: str, *args, **kwargs) -> 'Waveform':
@@ -30,9 +88,19 @@ class WaveformRegistry:
 
 
 class Waveform:
-    def __init_subclass__(cls, **kwargs):
+    # dtype of the generated waveforms. The DAC takes 16-bit I/Q samples, so single precision is enough
+    DTYPE = np.complex64
+
+    def __init_subclass__(cls, shape: str = None, **kwargs):
+        """
+        register the subclass under its class name, and under the alias shape when given, e.g.
+        class GaussianChirp(GaussianModulated, shape="gaussian_chirp"). Instances that are created with a shape alias
+        register it themselves, the class name is always registered here.
+        """
         super().__init_subclass__(**kwargs)
         WaveformRegistry.register(cls.__name__, cls)
+        if shape is not None:
+            WaveformRegistry.register(shape, cls)
 
     def __init__(self, prog: QickProgram, gen_ch: Union[int, str], phase, maxv):
         self._set_channel_cfg(prog, gen_ch)
@@ -63,7 +131,10 @@ class Waveform:
             # warnings.warn("pulse amplitude exceeded maxv")
             print(f"pulse '{name}' amplitude exceeded maxv by {np.max((i_max, q_max)) - 32766}")
 
-        prog.add_pulse(self.gen_ch, name, idata=idata.astype(int), qdata=qdata.astype(int))
+        # the DAC samples are 16-bit, round to the nearest integer (as qick does for float data) before the cast
+        np.rint(idata, out=idata)
+        np.rint(qdata, out=qdata)
+        prog.add_pulse(self.gen_ch, name, idata=idata.astype(np.int16), qdata=qdata.astype(np.int16))
 
     def _set_channel_cfg(self, prog: QickProgram, gen_ch: Union[int, str]):
         self.gen_ch = prog.cfg["gen_chs"][gen_ch]["ch"] if isinstance(gen_ch, str) else gen_ch
@@ -88,8 +159,30 @@ class Waveform:
         elif isinstance(padding, (int, float)):
             padding = [0, padding]
 
-        padding_reg = np.ceil(self.us_to_samps(np.array(padding))).astype(int)
-        return np.pad(data, (padding_reg[0], padding_reg[1]))
+        n0, n1 = np.ceil(self.us_to_samps(np.array(padding))).astype(int)
+        if n0 == 0 and n1 == 0:
+            return data
+        # copy the waveform into the middle of a zero buffer
+        padded = np.zeros(n0 + len(data) + n1, dtype=data.dtype)
+        padded[n0:n0 + len(data)] = data
+        return padded
+
+    def _apply_phase(self, waveform: np.ndarray) -> np.ndarray:
+        """
+        Rotate the waveform by self.phase (in degree), same as np.exp(1j * np.deg2rad(self.phase)) * waveform. For a
+        real waveform, the I and Q parts are written directly into one complex array.
+        """
+        if np.iscomplexobj(waveform):
+            return np.exp(1j * np.deg2rad(self.phase)) * waveform
+        out = np.empty(np.shape(waveform), dtype=np.complex128)
+        if self.phase == 0:
+            out.real = waveform
+            out.imag = 0
+            return out
+        ph = math.radians(self.phase)
+        np.multiply(waveform, math.cos(ph), out=out.real)
+        np.multiply(waveform, math.sin(ph), out=out.imag)
+        return out
 
     def plot_waveform(self, ax=None, clock_cycle=False):
         """Plots the waveform."""
@@ -119,10 +212,8 @@ class Gaussian(Waveform):
 
     @staticmethod
     def core(length, sigma):
-        """the definetion of Gaussian"""
-        t = np.arange(length)
-        y = np.exp(-(t - length / 2) ** 2 / sigma ** 2)
-        return y - np.min(y)
+        """the definetion of Gaussian, the returned array is cached and read-only"""
+        return _gaussian_core(float(length), float(sigma))
 
     def _generate_waveform(self, *args, **kwargs):
         """
@@ -131,8 +222,8 @@ class Gaussian(Waveform):
         """
         waveform = self.maxv * self.core(*args, **kwargs)
         waveform_padded = self._apply_padding(waveform, self.padding)
-        waveform_wphase = np.exp(1j * np.deg2rad(self.phase)) * waveform_padded
-        return waveform_wphase
+        waveform_wphase = self._apply_phase(waveform_padded)
+        return waveform_wphase.astype(self.DTYPE, copy=False)
 
 
 class TanhBox(Waveform):
@@ -153,13 +244,9 @@ class TanhBox(Waveform):
         :param length: number of points of the pulse
         :param ramp_width: number of points from cutOffset to 0.95 amplitude
         :param cut_offset: the initial offset to cut on the tanh Function
-        :return:
+        :return: the pulse shape, cached and read-only
         """
-        t = np.arange(length)
-        c0_, c1_ = np.arctanh(2 * cut_offset - 1), np.arctanh(2 * 0.95 - 1)
-        k_ = (c1_ - c0_) / ramp_width
-        y = (0.5 * (np.tanh(k_ * t + c0_) - np.tanh(k_ * (t - length) - c0_)) - cut_offset) / (1 - cut_offset)
-        return y - np.min(y)
+        return _tanhbox_core(float(length), float(ramp_width), float(cut_offset))
 
     def _generate_waveform(self, *args, **kwargs):
         """
@@ -168,8 +255,8 @@ class TanhBox(Waveform):
         """
         waveform = self.maxv * self.core(*args, **kwargs)
         waveform_padded = self._apply_padding(waveform, self.padding)
-        waveform_wphase = np.exp(1j * np.deg2rad(self.phase)) * waveform_padded
-        return waveform_wphase
+        waveform_wphase = self._apply_phase(waveform_padded)
+        return waveform_wphase.astype(self.DTYPE, copy=False)
 
 
 class FileDefined(Waveform):
@@ -197,7 +284,7 @@ class FileDefined(Waveform):
             qdata = data[:, 1]  # Second column: Q data
             return idata + 1j * qdata
         elif filetype == "csv":
-            data = np.loadtxt(filepath, **kwargs)  # Assuming the file contains a two-column format (I, Q)
+            data = _load_columns(filepath, **kwargs)  # Assuming the file contains a two-column format (I, Q)
             idata = data[:, 0]  # First column: I data
             qdata = data[:, 1]  # Second column: Q data
             return idata + 1j * qdata
@@ -217,9 +304,9 @@ class FileDefined(Waveform):
         """
         waveform = self.core(*args, **kwargs)
         waveform_padded = self._apply_padding(waveform, self.padding)
-        waveform_wphase = np.exp(1j * np.deg2rad(self.phase)) * waveform_padded
+        waveform_wphase = self._apply_phase(waveform_padded)
         # waveform_dragged = self.apply_drag_modulation(waveform_wphase, drag_coeff=self.drag_coeff)
-        return waveform_wphase
+        return waveform_wphase.astype(self.DTYPE, copy=False)
 
 
 class GaussianModulated(Waveform):
@@ -231,15 +318,13 @@ class GaussianModulated(Waveform):
         self.padding = padding
         self.modulations = modulations
         self.waveform = self._generate_waveform(self.length_samps, self.sigma_samps)
-        shape = shape if shape is not None else self.__class__.__name__
-        WaveformRegistry.register(shape, self.__class__)
+        if shape is not None:
+            WaveformRegistry.register(shape, self.__class__)
 
     @staticmethod
     def core(length, sigma):
-        """the definetion of Gaussian"""
-        t = np.arange(length)
-        y = np.exp(-(t - length / 2) ** 2 / sigma ** 2)
-        return y - np.min(y)
+        """the definetion of Gaussian, the returned array is cached and read-only"""
+        return _gaussian_core(float(length), float(sigma))
 
     def _generate_waveform(self, *args, **kwargs):
         """
@@ -248,10 +333,10 @@ class GaussianModulated(Waveform):
         """
         waveform = self.maxv * self.core(*args, **kwargs)
         waveform = self._apply_padding(waveform, self.padding)
-        waveform = np.exp(1j * np.deg2rad(self.phase)) * waveform
+        waveform = self._apply_phase(waveform)
         for mod in self.modulations:
             waveform = mod.apply_modulation(waveform, self.sampling_rate)
-        return waveform
+        return waveform.astype(self.DTYPE, copy=False)
 
 
 class TanhBoxModulated(Waveform):
@@ -264,8 +349,8 @@ class TanhBoxModulated(Waveform):
         self.padding = padding
         self.modulations = modulations
         self.waveform = self._generate_waveform(self.length_samps, self.ramp_samps, self.cut_offset)
-        shape = shape if shape is not None else self.__class__.__name__
-        WaveformRegistry.register(shape, self.__class__)
+        if shape is not None:
+            WaveformRegistry.register(shape, self.__class__)
 
     @staticmethod
     def core(length, ramp_width, cut_offset):
@@ -275,13 +360,9 @@ class TanhBoxModulated(Waveform):
         :param length: number of points of the pulse
         :param ramp_width: number of points from cutOffset to 0.95 amplitude
         :param cut_offset: the initial offset to cut on the tanh Function
-        :return:
+        :return: the pulse shape, cached and read-only
         """
-        t = np.arange(length)
-        c0_, c1_ = np.arctanh(2 * cut_offset - 1), np.arctanh(2 * 0.95 - 1)
-        k_ = (c1_ - c0_) / ramp_width
-        y = (0.5 * (np.tanh(k_ * t + c0_) - np.tanh(k_ * (t - length) - c0_)) - cut_offset) / (1 - cut_offset)
-        return y - np.min(y)
+        return _tanhbox_core(float(length), float(ramp_width), float(cut_offset))
 
     def _generate_waveform(self, *args, **kwargs):
         """
@@ -290,10 +371,10 @@ class TanhBoxModulated(Waveform):
         """
         waveform = self.maxv * self.core(*args, **kwargs)
         waveform = self._apply_padding(waveform, self.padding)
-        waveform = np.exp(1j * np.deg2rad(self.phase)) * waveform
+        waveform = self._apply_phase(waveform)
         for mod in self.modulations:
             waveform = mod.apply_modulation(waveform, self.sampling_rate)
-        return waveform
+        return waveform.astype(self.DTYPE, copy=False)
 
 
 class ConcatenateWaveform(Waveform):
@@ -301,11 +382,14 @@ class ConcatenateWaveform(Waveform):
         super().__init__(prog, gen_ch, phase, maxv)
         self.wavefrom_list = waveforms
         self.waveform = self._generate_waveform()
-        shape = shape if shape is not None else self.__class__.__name__
-        WaveformRegistry.register(shape, self.__class__)
+        if shape is not None:
+            WaveformRegistry.register(shape, self.__class__)
 
     def _generate_waveform(self):
-        return np.concatenate([w.waveform for w in self.wavefrom_list])
+        # concatenate straight into the preallocated output
+        waveforms = tuple(w.waveform for w in self.wavefrom_list)
+        waveform = np.empty(sum(len(wf) for wf in waveforms), dtype=self.DTYPE)
+        return np.concatenate(waveforms, out=waveform)
 
 
 def add_waveform(prog: QickProgram, gen_ch, name, shape, **kwargs):